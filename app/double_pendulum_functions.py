@@ -1,22 +1,32 @@
-from typing import Tuple, List, Union, Iterable
+from typing import Tuple, List, Union, Iterable, Optional, Callable
+from functools import lru_cache
 import numpy as np
-from numpy.core._multiarray_umath import ndarray
+from numpy import ndarray
 import scipy.constants
 import scipy.integrate
-import matplotlib.pyplot as plt
+from numba import cfunc, njit, prange, types
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.patches import Circle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
 import os.path as osp
 import ffmpeg
-import glob
 
 g = scipy.constants.g
 this_dir = osp.dirname(osp.realpath(__file__))
 
+# The animation frame geometry. Shared by the frame renderer and the ffmpeg rawvideo pipe, which must agree on the
+# pixel dimensions. Defined from exact pixel targets so the frames come out an even 600x450, which yuv420p requires.
+_fig_dpi = 72
+_fig_size = (600 / _fig_dpi, 450 / _fig_dpi)
 
-def lagrangian_1(positions: ndarray, l1: float, l2: float, m1: float, m2: float) -> float:
+
+def pendulum_derivatives(positions: ndarray, t: float, l1: float, l2: float, m1: float, m2: float) \
+        -> Tuple[float, float, float, float]:
     """
-    Will return the angular acceleration of the first pendulum.
+    Will return the derivatives of the angles and angular velocity. Delegates to the fused _rhs kernel, so the
+    shared sin/cos terms of the two angular accelerations are computed exactly once instead of twice per call.
 
     :param positions: 4D np array of [angle 1, angular velocity 1, angle 2, angular velocity 2] in radians and radians
     per second
@@ -25,82 +35,459 @@ def lagrangian_1(positions: ndarray, l1: float, l2: float, m1: float, m2: float)
     :param l2: Rod length of the second pendulum in meters.
     :param m1: Mass of the first ball in kg.
     :param m2: Mass of the second ball in kg
-    :return: angular acceleration 1
+    :return: Tuple of (angular velocity 1, angular acceleration 1, angular velocity 2, angular acceleration 2)
     """
     o1, w1, o2, w2 = positions
-    s, c = np.sin(o2 - o1), np.cos(o2 - o1)
+    return _rhs(o1, w1, o2, w2, l1, l2, m1, m2)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rhs(o1: float, w1: float, o2: float, w2: float, l1: float, l2: float, m1: float, m2: float) \
+        -> Tuple[float, float, float, float]:
+    """
+    The fused, Numba compiled double pendulum kernel. Both angular accelerations come from the same Lagrangian
+    algebra, so every sin/cos is computed exactly once and the whole thing runs in native code, meaning the
+    integrator never has to bounce back into Python per step.
+
+    :param o1: Angle of the first pendulum in radians.
+    :param w1: Angular velocity of the first pendulum in radians per second.
+    :param o2: Angle of the second pendulum in radians.
+    :param w2: Angular velocity of the second pendulum in radians per second.
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :return: Tuple of (angular velocity 1, angular acceleration 1, angular velocity 2, angular acceleration 2)
+    """
+    s = np.sin(o2 - o1)
+    c = np.cos(o2 - o1)
+    so1 = np.sin(o1)
+    so2 = np.sin(o2)
+    c2 = c * c
+    m12 = m1 + m2
+
+    a1 = (m2 * l1 * s * c * w1 ** 2 + m2 * g * so2 * c + m2 * l2 * s * w2 ** 2 - m12 * g * so1) \
+        / (m12 * l1 - m2 * l1 * c2)
+    a2 = (m12 * (g * so1 * c - l1 * s * w1 ** 2 - g * so2) - m2 * l2 * s * c * w2 ** 2) \
+        / (m12 * l2 - m2 * l2 * c2)
 
-    a1 = m2 * l1 * s * c * w1 ** 2
-    a2 = m2 * g * np.sin(o2) * c
-    a3 = m2 * l2 * s * w2 ** 2
-    a4 = (m1 + m2) * g * np.sin(o1)
+    return w1, a1, w2, a2
 
-    b1 = (m1 + m2) * l1
-    b2 = m2 * l1 * c ** 2
 
-    return (a1 + a2 + a3 - a4) / (b1 - b2)
+# The C signature shared by lsoda-style solver libraries: f(t, y, ydot, user_data), all doubles.
+_rhs_c_signature = types.void(types.double, types.CPointer(types.double), types.CPointer(types.double),
+                              types.CPointer(types.double))
 
 
-def lagrangian_2(positions: ndarray, l1: float, l2: float, m1: float, m2: float) -> float:
+@cfunc(_rhs_c_signature, cache=True, fastmath=True, nogil=True)
+def rhs_cfunc(t, y, ydot, params):
     """
-    Will return the angular acceleration of the second pendulum.
+    The _rhs kernel compiled to a bare C function: 4 doubles in, 4 doubles out, no Python anywhere in the call. Its
+    pointer is rhs_cfunc.address, which can be handed to any C ODE library with an lsoda/cvode style callback (for
+    example scikits.odes) so the solver never round-trips through the interpreter per step. params points at
+    [l1, l2, m1, m2]. SciPy's own odeint/solve_ivp cannot take this pointer, which is exactly why integrate()
+    defaults to the native RK4 loop instead.
+    """
+    w1, a1, w2, a2 = _rhs(y[0], y[1], y[2], y[3], params[0], params[1], params[2], params[3])
+    ydot[0] = w1
+    ydot[1] = a1
+    ydot[2] = w2
+    ydot[3] = a2
 
-    :param positions: 4D np array of [angle 1, angular velocity 1, angle 2, angular velocity 2] in radians and radians
-    per second
-    :param t: Time parameter in seconds. Is not actually being used.
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _jac(o1: float, w1: float, o2: float, w2: float, l1: float, l2: float, m1: float, m2: float) -> ndarray:
+    """
+    The analytic 4x4 Jacobian of the _rhs derivatives with respect to [o1, w1, o2, w2]. Derived symbolically with
+    SymPy (diff + cse) and hard coded here, so LSODA's implicit corrector never has to approximate it with extra
+    RHS evaluations. The x* names are the common subexpressions SymPy factored out.
+
+    :param o1: Angle of the first pendulum in radians.
+    :param w1: Angular velocity of the first pendulum in radians per second.
+    :param o2: Angle of the second pendulum in radians.
+    :param w2: Angular velocity of the second pendulum in radians per second.
     :param l1: Rod length of the first pendulum in meters.
     :param l2: Rod length of the second pendulum in meters.
     :param m1: Mass of the first ball in kg.
     :param m2: Mass of the second ball in kg
-    :return: angular acceleration 2
+    :return: A 2D (4, 4) ndarray, entry [i, j] being d(_rhs[i])/d(y[j]).
     """
-    o1, w1, o2, w2 = positions
-    s, c = np.sin(o2 - o1), np.cos(o2 - o1)
+    x0 = g * np.sin(o1)
+    x1 = m1 + m2
+    x2 = 2.0 * x1
+    x3 = o1 - o2
+    x4 = np.cos(x3)
+    x5 = g * np.sin(o2)
+    x6 = 2.0 * m2
+    x7 = np.sin(x3)
+    x8 = l2 * w2 ** 2
+    x9 = m2 * x8
+    x10 = l1 * w1 ** 2
+    x11 = 2.0 * x3
+    x12 = m2 * np.sin(x11)
+    x13 = x4 * x7
+    x14 = x13 * (x0 * x2 + x10 * x12 - x4 * x5 * x6 + 2.0 * x7 * x9)
+    x15 = x4 ** 2
+    x16 = m2 * x15
+    x17 = x1 - x16
+    x18 = g * np.cos(o1)
+    x19 = x5 * x7
+    x20 = x4 * x8
+    x21 = x7 ** 2
+    x22 = x10 * x21
+    x23 = 1.0 / l1
+    x24 = 1.0 / x17 ** 2
+    x25 = x23 * x24
+    x26 = 2.0 * x12 / (2.0 * m1 - m2 * np.cos(x11) + m2)
+    x27 = g * np.cos(o2)
+    x28 = x7 / x17
+    x29 = m2 * x13 * (x12 * x8 + x2 * (x0 * x4 + x10 * x7 - x5))
+    x30 = -x0 * x7 + x10 * x4
+    x31 = x16 * x8 - x21 * x9
+    x32 = 1.0 / l2
+    x33 = x24 * x32
+
+    jacobian = np.zeros((4, 4))
+    jacobian[0, 1] = 1.0
+    jacobian[1, 0] = x25 * (m2 * x14 - x17 * (m2 * x19 + m2 * x20 - m2 * x22 + x1 * x18 + x10 * x16))
+    jacobian[1, 1] = -w1 * x26
+    jacobian[1, 2] = m2 * x25 * (-x14 + x17 * (x10 * x15 + x19 + x20 - x22 + x27 * x4))
+    jacobian[1, 3] = -l2 * w2 * x23 * x28 * x6
+    jacobian[2, 3] = 1.0
+    jacobian[3, 0] = -x33 * (x29 - x17 * (x1 * (x18 * x4 + x30) + x31))
+    jacobian[3, 1] = l1 * w1 * x2 * x28 * x32
+    jacobian[3, 2] = x33 * (x29 - x17 * (x1 * (x27 + x30) + x31))
+    jacobian[3, 3] = w2 * x26
+    return jacobian
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _hamiltonian_dp(o1: float, o2: float, p1: float, p2: float, l1: float, l2: float, m1: float, m2: float) \
+        -> Tuple[float, float]:
+    """
+    The partial derivatives of the double pendulum Hamiltonian with respect to the conjugate momenta p1 and p2,
+    which are the angular velocities. Also serves as the momentum-to-velocity conversion, since it applies the
+    inverse of the angle dependent mass matrix.
+
+    :param o1: Angle of the first pendulum in radians.
+    :param o2: Angle of the second pendulum in radians.
+    :param p1: Conjugate momentum of the first pendulum in kg m^2 per second.
+    :param p2: Conjugate momentum of the second pendulum in kg m^2 per second.
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :return: Tuple of (dH/dp1, dH/dp2), the angular velocities in radians per second.
+    """
+    c = np.cos(o1 - o2)
+    s = np.sin(o1 - o2)
+    den = m1 + m2 * s * s
 
-    a1 = m2 * l2 * s * c * w2 ** 2
-    a2 = g * np.sin(o1) * c
-    a3 = l1 * s * w1 ** 2
-    a4 = g * np.sin(o2)
+    w1 = (l2 * p1 - l1 * p2 * c) / (l1 * l1 * l2 * den)
+    w2 = ((m1 + m2) * l1 * p2 - m2 * l2 * p1 * c) / (m2 * l1 * l2 * l2 * den)
+    return w1, w2
 
-    b1 = (m1 + m2) * l2
-    b2 = m2 * l2 * c ** 2
 
-    return ((m1 + m2) * (a2 - a3 - a4) - a1) / (b1 - b2)
+@njit(cache=True, fastmath=True, nogil=True)
+def _hamiltonian_dq(o1: float, o2: float, p1: float, p2: float, l1: float, l2: float, m1: float, m2: float) \
+        -> Tuple[float, float]:
+    """
+    The partial derivatives of the double pendulum Hamiltonian with respect to the angles o1 and o2. The momenta
+    evolve as p' = -dH/dq.
 
+    :param o1: Angle of the first pendulum in radians.
+    :param o2: Angle of the second pendulum in radians.
+    :param p1: Conjugate momentum of the first pendulum in kg m^2 per second.
+    :param p2: Conjugate momentum of the second pendulum in kg m^2 per second.
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :return: Tuple of (dH/do1, dH/do2).
+    """
+    c = np.cos(o1 - o2)
+    s = np.sin(o1 - o2)
+    den = m1 + m2 * s * s
 
-def pendulum_derivatives(positions: ndarray, t: float, l1: float, l2: float, m1: float, m2: float) \
-        -> Tuple[float, float, float, float]:
+    c1 = p1 * p2 * s / (l1 * l2 * den)
+    c2 = (m2 * l2 * l2 * p1 * p1 + (m1 + m2) * l1 * l1 * p2 * p2 - 2.0 * m2 * l1 * l2 * p1 * p2 * c) \
+        * np.sin(2.0 * (o1 - o2)) / (2.0 * l1 * l1 * l2 * l2 * den * den)
+
+    dh_do1 = (m1 + m2) * g * l1 * np.sin(o1) + c1 - c2
+    dh_do2 = m2 * g * l2 * np.sin(o2) - c1 + c2
+    return dh_do1, dh_do2
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _verlet(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: float, dt: float, save_steps: ndarray,
+            out: ndarray) -> None:
     """
-    Will return the derivatives of the angles and angular velocity.
+    A fixed step Stoermer-Verlet loop in the canonical (angle, momentum) variables. Symplectic, so it conserves a
+    modified Hamiltonian to O(dt^2) with no secular energy drift, which lets callers take larger time steps than a
+    non-symplectic scheme for the same long run energy error. The double pendulum Hamiltonian is not separable, so
+    the two implicit half stages are resolved with a few fixed point iterations each.
 
-    :param positions: 4D np array of [angle 1, angular velocity 1, angle 2, angular velocity 2] in radians and radians
-    per second
-    :param t: Time parameter in seconds. Is not actually being used.
+    :param initial_positions: The initial starting positions. 4D np array of [angle 1, angular velocity 1, angle 2,
+    angular velocity 2] in radians and radians per second
     :param l1: Rod length of the first pendulum in meters.
     :param l2: Rod length of the second pendulum in meters.
     :param m1: Mass of the first ball in kg.
     :param m2: Mass of the second ball in kg
-    :return: Tuple of (angular velocity 1, angular acceleration 1, angular velocity 2, angular acceleration 2)
+    :param dt: The time step.
+    :param save_steps: The strictly increasing step indices whose states should be stored, one per row of out. The
+    loop always marches every step up to save_steps[-1]; this only controls what is kept.
+    :param out: A 2D (save_steps.size, 4) array that receives the [o1, w1, o2, w2] rows.
     """
-    o1, w1, o2, w2 = positions
+    fixed_point_iterations = 4
+    # The fixed point stages only converge while dt times the angular velocity stays small. Past this momentum the
+    # iteration has stopped converging and the state is pure overflow on its way to raising from deep inside the
+    # kernel, so fail loudly with a usable message instead.
+    blow_up_momentum = 1e6
+
+    o1, w1, o2, w2 = initial_positions[0], initial_positions[1], initial_positions[2], initial_positions[3]
+    j = 0
+    if save_steps[0] == 0:
+        out[0, 0], out[0, 1], out[0, 2], out[0, 3] = o1, w1, o2, w2
+        j = 1
+
+    # Convert the angular velocities to conjugate momenta by applying the mass matrix.
+    c = np.cos(o1 - o2)
+    p1 = (m1 + m2) * l1 * l1 * w1 + m2 * l1 * l2 * w2 * c
+    p2 = m2 * l2 * l2 * w2 + m2 * l1 * l2 * w1 * c
+
+    half_dt = 0.5 * dt
+    for i in range(1, save_steps[-1] + 1):
+        # Written so a NaN momentum also fails the check, since fastmath makes np.isnan unreliable.
+        if not (abs(p1) < blow_up_momentum and abs(p2) < blow_up_momentum):
+            raise ValueError('The Verlet fixed point iteration diverged. The time step dt is too large for this '
+                             'trajectory; rerun with a smaller dt.')
+
+        # Half kick, implicit in the momenta.
+        q1, q2 = _hamiltonian_dq(o1, o2, p1, p2, l1, l2, m1, m2)
+        ph1, ph2 = p1 - half_dt * q1, p2 - half_dt * q2
+        for _ in range(fixed_point_iterations):
+            q1, q2 = _hamiltonian_dq(o1, o2, ph1, ph2, l1, l2, m1, m2)
+            ph1, ph2 = p1 - half_dt * q1, p2 - half_dt * q2
+
+        # Full drift, implicit in the angles.
+        v1a, v2a = _hamiltonian_dp(o1, o2, ph1, ph2, l1, l2, m1, m2)
+        no1, no2 = o1 + dt * v1a, o2 + dt * v2a
+        for _ in range(fixed_point_iterations):
+            v1b, v2b = _hamiltonian_dp(no1, no2, ph1, ph2, l1, l2, m1, m2)
+            no1, no2 = o1 + half_dt * (v1a + v1b), o2 + half_dt * (v2a + v2b)
+        o1, o2 = no1, no2
+
+        # Half kick, explicit.
+        q1, q2 = _hamiltonian_dq(o1, o2, ph1, ph2, l1, l2, m1, m2)
+        p1, p2 = ph1 - half_dt * q1, ph2 - half_dt * q2
+
+        if j < save_steps.size and i == save_steps[j]:
+            # The momenta, not the angular velocities, carry the state between steps, so the conversion back is
+            # only paid for the rows that are actually kept.
+            w1, w2 = _hamiltonian_dp(o1, o2, p1, p2, l1, l2, m1, m2)
+            out[j, 0], out[j, 1], out[j, 2], out[j, 3] = o1, w1, o2, w2
+            j += 1
+
+
+def _rhs_ivp(t: float, y: ndarray, l1: float, l2: float, m1: float, m2: float) -> Tuple[float, float, float, float]:
+    """Adapts the _rhs kernel to the f(t, y) signature solve_ivp expects."""
+    return _rhs(y[0], y[1], y[2], y[3], l1, l2, m1, m2)
+
+
+def _jac_ivp(t: float, y: ndarray, l1: float, l2: float, m1: float, m2: float) -> ndarray:
+    """Adapts the _jac kernel to the jac(t, y) signature solve_ivp expects."""
+    return _jac(y[0], y[1], y[2], y[3], l1, l2, m1, m2)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rk4(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: float, dt: float, out: ndarray) -> None:
+    """
+    A fixed step RK4 loop that runs entirely in native code. The output rows are written in-place into the caller's
+    preallocated array (which may be a strided view), so there is no allocation or copy at all.
+
+    :param initial_positions: The initial starting positions. 4D np array of [angle 1, angular velocity 1, angle 2,
+    angular velocity 2] in radians and radians per second
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :param dt: The time step.
+    :param out: A 2D (time steps, 4) array that receives the [o1, w1, o2, w2] rows, row 0 being the initial position.
+    """
+    n = out.shape[0]
+    o1, w1, o2, w2 = initial_positions[0], initial_positions[1], initial_positions[2], initial_positions[3]
+    out[0, 0], out[0, 1], out[0, 2], out[0, 3] = o1, w1, o2, w2
+
+    for i in range(1, n):
+        k1 = _rhs(o1, w1, o2, w2, l1, l2, m1, m2)
+        k2 = _rhs(o1 + 0.5 * dt * k1[0], w1 + 0.5 * dt * k1[1], o2 + 0.5 * dt * k1[2], w2 + 0.5 * dt * k1[3],
+                  l1, l2, m1, m2)
+        k3 = _rhs(o1 + 0.5 * dt * k2[0], w1 + 0.5 * dt * k2[1], o2 + 0.5 * dt * k2[2], w2 + 0.5 * dt * k2[3],
+                  l1, l2, m1, m2)
+        k4 = _rhs(o1 + dt * k3[0], w1 + dt * k3[1], o2 + dt * k3[2], w2 + dt * k3[3], l1, l2, m1, m2)
+
+        o1 += dt / 6.0 * (k1[0] + 2.0 * k2[0] + 2.0 * k3[0] + k4[0])
+        w1 += dt / 6.0 * (k1[1] + 2.0 * k2[1] + 2.0 * k3[1] + k4[1])
+        o2 += dt / 6.0 * (k1[2] + 2.0 * k2[2] + 2.0 * k3[2] + k4[2])
+        w2 += dt / 6.0 * (k1[3] + 2.0 * k2[3] + 2.0 * k3[3] + k4[3])
 
-    angular_velocity_1 = w1
-    angular_acceleration_1 = lagrangian_1(positions, l1, l2, m1, m2)
-    angular_velocity_2 = w2
-    angular_acceleration_2 = lagrangian_2(positions, l1, l2, m1, m2)
-    return angular_velocity_1, angular_acceleration_1, angular_velocity_2, angular_acceleration_2
+        out[i, 0], out[i, 1], out[i, 2], out[i, 3] = o1, w1, o2, w2
 
 
-def calculate_total_energy(positions: ndarray, l1, l2, m1, m2) -> float:
+@njit(cache=True, fastmath=True, nogil=True)
+def _rk4_sampled(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: float, dt: float,
+                 save_steps: ndarray, out: ndarray) -> None:
     """
-    :param positions: 4D np array of [angle 1, angular velocity 1, angle 2, angular velocity 2] in radians and radians
-    per second
+    The same fixed step RK4 loop as _rk4, but it only stores the steps listed in save_steps. The integration still
+    marches every dt step for accuracy; only the storage is thinned out, so asking for just the endpoints of a long
+    run costs two rows of memory instead of the whole trajectory.
+
+    :param initial_positions: The initial starting positions. 4D np array of [angle 1, angular velocity 1, angle 2,
+    angular velocity 2] in radians and radians per second
     :param l1: Rod length of the first pendulum in meters.
     :param l2: Rod length of the second pendulum in meters.
     :param m1: Mass of the first ball in kg.
     :param m2: Mass of the second ball in kg
-    :return: The total energy of the system in Joules.
+    :param dt: The time step.
+    :param save_steps: The strictly increasing step indices whose states should be stored, one per row of out.
+    :param out: A 2D (save_steps.size, 4) array that receives the [o1, w1, o2, w2] rows.
+    """
+    o1, w1, o2, w2 = initial_positions[0], initial_positions[1], initial_positions[2], initial_positions[3]
+    j = 0
+    if save_steps[0] == 0:
+        out[0, 0], out[0, 1], out[0, 2], out[0, 3] = o1, w1, o2, w2
+        j = 1
+
+    for i in range(1, save_steps[-1] + 1):
+        k1 = _rhs(o1, w1, o2, w2, l1, l2, m1, m2)
+        k2 = _rhs(o1 + 0.5 * dt * k1[0], w1 + 0.5 * dt * k1[1], o2 + 0.5 * dt * k1[2], w2 + 0.5 * dt * k1[3],
+                  l1, l2, m1, m2)
+        k3 = _rhs(o1 + 0.5 * dt * k2[0], w1 + 0.5 * dt * k2[1], o2 + 0.5 * dt * k2[2], w2 + 0.5 * dt * k2[3],
+                  l1, l2, m1, m2)
+        k4 = _rhs(o1 + dt * k3[0], w1 + dt * k3[1], o2 + dt * k3[2], w2 + dt * k3[3], l1, l2, m1, m2)
+
+        o1 += dt / 6.0 * (k1[0] + 2.0 * k2[0] + 2.0 * k3[0] + k4[0])
+        w1 += dt / 6.0 * (k1[1] + 2.0 * k2[1] + 2.0 * k3[1] + k4[1])
+        o2 += dt / 6.0 * (k1[2] + 2.0 * k2[2] + 2.0 * k3[2] + k4[2])
+        w2 += dt / 6.0 * (k1[3] + 2.0 * k2[3] + 2.0 * k3[3] + k4[3])
+
+        if j < save_steps.size and i == save_steps[j]:
+            out[j, 0], out[j, 1], out[j, 2], out[j, 3] = o1, w1, o2, w2
+            j += 1
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rk2(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: float, dt: float, n_steps: int,
+         max_swing: float) -> ndarray:
+    """
+    A midpoint (RK2) loop that only returns the final state. This is the cheap coarse propagator for the parareal
+    scheme, where it just has to predict subinterval boundary states well enough for the fine corrections to
+    converge. Each nominal step is subdivided so that neither pendulum rotates more than max_swing radians per
+    substep; the parareal correction can hand this function wildly spinning states, and without the cap the big
+    coarse steps go unstable and blow up.
+
+    :param initial_positions: The initial starting positions. 4D np array of [angle 1, angular velocity 1, angle 2,
+    angular velocity 2] in radians and radians per second
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :param dt: The nominal time step.
+    :param n_steps: The number of nominal steps to take.
+    :param max_swing: The largest rotation in radians either pendulum may cover in one substep.
+    :return: The final [o1, w1, o2, w2] state as a 4D np array.
+    """
+    o1, w1, o2, w2 = initial_positions[0], initial_positions[1], initial_positions[2], initial_positions[3]
+    # The slowest timescale the step subdivision should ever assume, so calm states still get split sanely.
+    base_speed = np.sqrt(g / min(l1, l2))
+    # Past this angular velocity the state is a diverged correction, not physics; bail out and let the caller
+    # discard it instead of grinding through ever smaller substeps or overflowing into fastmath undefined behavior.
+    blow_up_speed = 1e6
+
+    out = np.full(4, np.nan)
+    if not (np.isfinite(o1) and np.isfinite(w1) and np.isfinite(o2) and np.isfinite(w2)):
+        return out
+
+    for _ in range(n_steps):
+        speed = max(abs(w1), abs(w2), base_speed)
+        if speed > blow_up_speed:
+            return out
+        n_sub = int(dt * speed / max_swing) + 1
+        h = dt / n_sub
+        for _ in range(n_sub):
+            if abs(w1) > blow_up_speed or abs(w2) > blow_up_speed:
+                return out
+            k1 = _rhs(o1, w1, o2, w2, l1, l2, m1, m2)
+            k2 = _rhs(o1 + 0.5 * h * k1[0], w1 + 0.5 * h * k1[1], o2 + 0.5 * h * k1[2], w2 + 0.5 * h * k1[3],
+                      l1, l2, m1, m2)
+            o1 += h * k2[0]
+            w1 += h * k2[1]
+            o2 += h * k2[2]
+            w2 += h * k2[3]
+
+    out[0], out[1], out[2], out[3] = o1, w1, o2, w2
+    return out
+
+
+@lru_cache(maxsize=16)
+def _compiled_rk4(l1: float, l2: float, m1: float, m2: float) -> Callable[[ndarray, float, ndarray], None]:
+    """
+    Compiles an RK4 loop with this exact parameter set closed over, so Numba freezes the lengths and masses as
+    compile time constants and they fold into the generated code instead of being reloaded every step. The lru_cache
+    means each distinct (l1, l2, m1, m2) pays the compile once per process and later runs with the same parameters
+    reuse it. A closure cannot use Numba's disk cache, so the compile cost comes back in every fresh process, and the
+    measured steady state gain over the disk cached generic _rk4 is only a few percent. That makes this a net loss
+    for one-off runs; it is opt-in via integrate(specialize=True) for callers that integrate the same parameter set
+    many times within one process.
+
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :return: A compiled rk4(initial_positions, dt, out) with the same in-place contract as _rk4.
+    """
+    @njit(fastmath=True, nogil=True)
+    def rk4(initial_positions: ndarray, dt: float, out: ndarray) -> None:
+        _rk4(initial_positions, l1, l2, m1, m2, dt, out)
+
+    return rk4
+
+
+@njit(cache=True, fastmath=True, nogil=True, parallel=True)
+def _rk4_batch(initial_positions: ndarray, l1s: ndarray, l2s: ndarray, m1s: ndarray, m2s: ndarray, dt: float,
+               out: ndarray) -> None:
+    """
+    Runs the fixed step RK4 loop for N independent trajectories across all cores with numba.prange. Each
+    trajectory's state is 4 doubles, so the per core working set is cache resident and the loop scales with the
+    sin/cos throughput of the machine.
+
+    :param initial_positions: The initial starting positions. 2D np array of N rows of [angle 1, angular velocity 1,
+    angle 2, angular velocity 2] in radians and radians per second
+    :param l1s: Rod lengths of the first pendulum in meters, one per trajectory.
+    :param l2s: Rod lengths of the second pendulum in meters, one per trajectory.
+    :param m1s: Masses of the first ball in kg, one per trajectory.
+    :param m2s: Masses of the second ball in kg, one per trajectory.
+    :param dt: The time step.
+    :param out: A 3D (N, time steps, 4) array that receives the [o1, w1, o2, w2] rows per trajectory.
     """
+    for k in prange(initial_positions.shape[0]):
+        _rk4(initial_positions[k], l1s[k], l2s[k], m1s[k], m2s[k], dt, out[k])
+
+
+def calculate_total_energy(positions: ndarray, l1, l2, m1, m2) -> ndarray:
+    """
+    Will return the total energy of the system at every time step. Works on the whole trajectory at once with NumPy
+    ufuncs, so energy drift diagnostics make one pass over the array instead of looping row by row in Python.
+
+    :param positions: 2D np array of N rows of [angle 1, angular velocity 1, angle 2, angular velocity 2] in radians
+    and radians per second
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :return: A 1D np array of N total energies of the system in Joules.
+    """
+    assert positions.ndim == 2
     o1, w1, o2, w2 = positions.T
 
     a1 = -(m1 + m2) * l1 * g * np.cos(o1)
@@ -118,8 +505,23 @@ def calculate_total_energy(positions: ndarray, l1, l2, m1, m2) -> float:
     return T + V
 
 
-def integrate(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: float, t_max: float, dt: float) \
-        -> ndarray:
+def calculate_total_energy_scalar(positions: ndarray, l1, l2, m1, m2) -> float:
+    """
+    The single state version of calculate_total_energy for callers holding one [o1, w1, o2, w2] row.
+
+    :param positions: 4D np array of [angle 1, angular velocity 1, angle 2, angular velocity 2] in radians and radians
+    per second
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :return: The total energy of the system in Joules.
+    """
+    return calculate_total_energy(positions[None, :], l1, l2, m1, m2)[0]
+
+
+def integrate(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: float, t_max: float, dt: float,
+              method: str = 'rk4', t_eval: Optional[ndarray] = None, specialize: bool = False) -> ndarray:
     """
     Will numerically integrate the double pendulum derivatives and return the time steps of the positions of the
     pendulums. The time steps will be from 0 to t_max.
@@ -132,27 +534,373 @@ def integrate(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: f
     :param m2: Mass of the second ball in kg
     :param t_max: The maximum time boundary. t_max is inclusive.
     :param dt: The time step.
+    :param method: 'rk4' for the fixed step Numba RK4 loop, 'verlet' for the symplectic Stoermer-Verlet loop, or
+    'lsoda' for SciPy's adaptive LSODA fed with the analytic Jacobian. 'rk4' is the fast default; 'verlet' has no
+    secular energy drift so it tolerates larger time steps on long runs; 'lsoda' gives tight error control when
+    accuracy matters more than speed.
+    :param t_eval: The times to report, snapped to the dt grid, strictly increasing and within [0, t_max]. None, the
+    default, reports every step. The integration always marches every dt step regardless; t_eval only thins out the
+    storage, so e.g. t_eval=np.array([0.0, t_max]) returns just the two endpoint rows instead of retaining the whole
+    trajectory.
+    :param specialize: Only affects 'rk4'. If True, compile an RK4 loop with this exact parameter set frozen in as
+    constants. The specialized loop is a few percent faster per step but cannot be disk cached, so every fresh
+    process pays its compile time again; it only pays off when one process integrates the same (l1, l2, m1, m2)
+    many millions of steps. The default False uses the generic disk cached loop.
+    :return: A 2D ndarray of 5 columns of [[t, o1, w1, o2, w2], ...], one row per reported time.
+    """
+    initial_positions = np.asarray(initial_positions, dtype=np.float64)
+
+    if t_eval is None:
+        t_array = np.arange(0, t_max + dt, dt)
+        save_steps = np.arange(t_array.size)
+    else:
+        t_eval = np.atleast_1d(np.asarray(t_eval, dtype=np.float64))
+        save_steps = np.rint(t_eval / dt).astype(np.int64)
+        # Compare on the snapped integer grid; multiplying the step index back by dt picks up float noise that
+        # would wrongly reject t_eval values like t_max itself.
+        if save_steps.size == 0 or save_steps[0] < 0 or save_steps[-1] > round(t_max / dt) \
+                or np.any(np.diff(save_steps) <= 0):
+            raise ValueError('t_eval has to be strictly increasing times within [0, t_max], at least dt apart.')
+        t_array = save_steps * dt
+
+    out = np.empty((t_array.size, 5))
+    out[:, 0] = t_array
+
+    if method == 'rk4':
+        if t_eval is not None:
+            _rk4_sampled(initial_positions, l1, l2, m1, m2, dt, save_steps, out[:, 1:])
+        elif specialize:
+            _compiled_rk4(float(l1), float(l2), float(m1), float(m2))(initial_positions, dt, out[:, 1:])
+        else:
+            _rk4(initial_positions, l1, l2, m1, m2, dt, out[:, 1:])
+    elif method == 'verlet':
+        _verlet(initial_positions, l1, l2, m1, m2, dt, save_steps, out[:, 1:])
+    elif method == 'lsoda':
+        solution = scipy.integrate.solve_ivp(_rhs_ivp, (0.0, t_array[-1]), initial_positions, method='LSODA',
+                                             t_eval=t_array, jac=_jac_ivp, rtol=1e-8, atol=1e-10,
+                                             args=(l1, l2, m1, m2))
+        out[:, 1:] = solution.y.T
+    else:
+        raise ValueError(f"Unknown method '{method}'. The choices are 'rk4', 'verlet' and 'lsoda'.")
+
+    return out
+
+
+def _pendulum_derivatives_batch(y: ndarray, t: float, l1, l2, m1, m2) -> ndarray:
+    """
+    The batched version of pendulum_derivatives. Works on a flat 4N vector of N stacked [o1, w1, o2, w2] states and
+    returns the flat 4N vector of stacked derivatives. All the math is NumPy array ops, so odeint pays its Python
+    callback cost once per step for all N trajectories instead of once per trajectory.
+
+    :param y: Flat 4N np array of N stacked [angle 1, angular velocity 1, angle 2, angular velocity 2] states in
+    radians and radians per second
+    :param t: Time parameter in seconds. Is not actually being used.
+    :param l1: Rod length of the first pendulum in meters. A scalar or a length N array.
+    :param l2: Rod length of the second pendulum in meters. A scalar or a length N array.
+    :param m1: Mass of the first ball in kg. A scalar or a length N array.
+    :param m2: Mass of the second ball in kg. A scalar or a length N array.
+    :return: Flat 4N np array of N stacked (angular velocity 1, angular acceleration 1, angular velocity 2,
+    angular acceleration 2)
+    """
+    o1, w1, o2, w2 = y.reshape(-1, 4).T
+
+    s = np.sin(o2 - o1)
+    c = np.cos(o2 - o1)
+    so1 = np.sin(o1)
+    so2 = np.sin(o2)
+    c2 = c * c
+    m12 = m1 + m2
+
+    a1 = (m2 * l1 * s * c * w1 ** 2 + m2 * g * so2 * c + m2 * l2 * s * w2 ** 2 - m12 * g * so1) \
+        / (m12 * l1 - m2 * l1 * c2)
+    a2 = (m12 * (g * so1 * c - l1 * s * w1 ** 2 - g * so2) - m2 * l2 * s * c * w2 ** 2) \
+        / (m12 * l2 - m2 * l2 * c2)
+
+    return np.column_stack((w1, a1, w2, a2)).ravel()
+
+
+def integrate_batch(initial_positions: ndarray, l1, l2, m1, m2, t_max: float, dt: float,
+                    method: str = 'rk4') -> ndarray:
+    """
+    Will numerically integrate N double pendulums in one call. The default runs the Numba RK4 loop over all the
+    trajectories with one parallel launch, one core per chunk of trajectories, with no Python in the loop at all.
+    The 'lsoda' method instead flattens the N states into a single 4N vector for odeint, which amortizes the
+    solver's per step overhead across the trajectories.
+
+    :param initial_positions: The initial starting positions. 2D np array of N rows of [angle 1, angular velocity 1,
+    angle 2, angular velocity 2] in radians and radians per second
+    :param l1: Rod length of the first pendulum in meters. A scalar or a length N array.
+    :param l2: Rod length of the second pendulum in meters. A scalar or a length N array.
+    :param m1: Mass of the first ball in kg. A scalar or a length N array.
+    :param m2: Mass of the second ball in kg. A scalar or a length N array.
+    :param t_max: The maximum time boundary. t_max is inclusive.
+    :param dt: The time step.
+    :param method: 'rk4' for the parallel Numba RK4 loop, or 'lsoda' for the vectorized odeint call.
+    :return: A 3D ndarray of shape (N, time steps, 5), where entry k is the [[t, o1, w1, o2, w2], ...] array for
+    trajectory k, the same layout integrate() returns.
+    """
+    t_array = np.arange(0, t_max + dt, dt)
+    initial_positions = np.asarray(initial_positions, dtype=np.float64)
+    n = initial_positions.shape[0]
+
+    out = np.empty((n, t_array.size, 5))
+    out[:, :, 0] = t_array
+
+    if method == 'rk4':
+        l1s, l2s, m1s, m2s = (np.ascontiguousarray(np.broadcast_to(np.asarray(p, dtype=np.float64), (n,)))
+                              for p in (l1, l2, m1, m2))
+        _rk4_batch(initial_positions, l1s, l2s, m1s, m2s, dt, out[:, :, 1:])
+    elif method == 'lsoda':
+        raw = scipy.integrate.odeint(_pendulum_derivatives_batch, initial_positions.ravel(), t_array,
+                                     args=(l1, l2, m1, m2))
+        out[:, :, 1:] = raw.reshape(t_array.size, n, 4).transpose(1, 0, 2)
+    else:
+        raise ValueError(f"Unknown method '{method}'. The choices are 'rk4' and 'lsoda'.")
+
+    return out
+
+
+def integrate_parareal(initial_positions: ndarray, l1: float, l2: float, m1: float, m2: float, t_max: float,
+                       dt: float, n_subintervals: Optional[int] = None, tol: float = 1e-8,
+                       max_iterations: Optional[int] = None) -> ndarray:
+    """
+    Will numerically integrate the double pendulum with the parareal parallel-in-time scheme. The time axis is split
+    into subintervals; a cheap large step RK2 propagator predicts the subinterval boundary states, then the fine RK4
+    propagator runs over all subintervals concurrently (the Numba kernels release the GIL, so threads really run in
+    parallel) and the boundary states are iteratively corrected with
+    U[k+1] = G(U[k]) + F(U_old[k]) - G(U_old[k]) until they stop moving. Only worthwhile for long runs where the
+    step count, not the per step cost, dominates; the result converges to the plain method='rk4' trajectory.
+
+    :param initial_positions: The initial starting positions. 4D np array of [angle 1, angular velocity 1, angle 2,
+    angular velocity 2] in radians and radians per second
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param m1: Mass of the first ball in kg.
+    :param m2: Mass of the second ball in kg
+    :param t_max: The maximum time boundary. t_max is inclusive.
+    :param dt: The fine propagator time step.
+    :param n_subintervals: The number of time subintervals, which is also the parallel width. Defaults to the number
+    of cores.
+    :param tol: Stop iterating once no boundary state component moved more than this between sweeps.
+    :param max_iterations: The iteration cap. Defaults to n_subintervals, at which point parareal is exact.
     :return: A 2D ndarray of 5 columns of [[t, o1, w1, o2, w2], ...]
     """
     t_array = np.arange(0, t_max + dt, dt)
-    position_array = scipy.integrate.odeint(pendulum_derivatives, initial_positions, t_array, args=(l1, l2, m1, m2))
-    t_array = t_array.reshape(t_array.size, 1)  # Convert the 1D array to a 2D array of single columns
-    return np.append(t_array, position_array, 1)
+    initial_positions = np.asarray(initial_positions, dtype=np.float64)
+    n = t_array.size
+
+    # os.cpu_count() can return None on exotic platforms, which min() and the index math below cannot take.
+    p = n_subintervals if n_subintervals is not None else os.cpu_count() or 1
+    p = min(p, n - 1)
+    if max_iterations is None:
+        max_iterations = p
+
+    # The subinterval boundaries as indexes into the fine time grid.
+    boundaries = np.linspace(0, n - 1, p + 1).astype(np.int64)
+    # The coarse propagator takes steps this many times larger than dt, subdividing on its own wherever the motion
+    # is too fast for that to be stable.
+    coarse_factor = 5
+    max_coarse_swing = 0.5
+
+    def coarse(state: ndarray, k: int) -> ndarray:
+        fine_steps = int(boundaries[k + 1] - boundaries[k])
+        n_steps = max(1, fine_steps // coarse_factor)
+        return _rk2(state, l1, l2, m1, m2, fine_steps * dt / n_steps, n_steps, max_coarse_swing)
+
+    # Angular velocities beyond this are garbage from a diverged correction, not physics; used to decide when to
+    # discard a corrected boundary state.
+    speed_limit = max(100.0, 10.0 * max(abs(initial_positions[1]), abs(initial_positions[3])))
+
+    def fine_end(state: ndarray, k: int) -> ndarray:
+        scratch = np.empty((int(boundaries[k + 1] - boundaries[k]) + 1, 4))
+        try:
+            _rk4(state, l1, l2, m1, m2, dt, scratch)
+        except ZeroDivisionError:
+            # The fine loop can overflow when fed a garbage early-iteration state; report it as non-finite so the
+            # correction below discards it.
+            return np.full(4, np.nan)
+        return scratch[-1]
+
+    # Initial serial coarse sweep to seed the boundary states.
+    boundary_states = np.empty((p + 1, 4))
+    boundary_states[0] = initial_positions
+    coarse_ends = np.empty((p, 4))
+    for k in range(p):
+        coarse_ends[k] = coarse(boundary_states[k], k)
+        boundary_states[k + 1] = coarse_ends[k]
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for _ in range(max_iterations):
+            fine_ends = list(pool.map(fine_end, boundary_states[:p], range(p)))
+
+            new_states = np.empty_like(boundary_states)
+            new_states[0] = initial_positions
+            for k in range(p):
+                new_coarse_end = coarse(new_states[k], k)
+                corrected = new_coarse_end + fine_ends[k] - coarse_ends[k]
+                # In strongly chaotic stretches an early-iteration correction can be garbage and send the
+                # propagators into a blow up; fall back to the plain coarse prediction until later iterations,
+                # which sweep the exact fine states forward, overwrite it.
+                if not np.all(np.isfinite(corrected)) or max(abs(corrected[1]), abs(corrected[3])) > speed_limit:
+                    corrected = new_coarse_end
+                new_states[k + 1] = corrected
+                coarse_ends[k] = new_coarse_end
+
+            delta = np.max(np.abs(new_states - boundary_states))
+            boundary_states = new_states
+            if delta < tol:
+                break
+
+        # One last parallel fine sweep from the converged boundary states fills in the output rows.
+        out = np.empty((n, 5))
+        out[:, 0] = t_array
+
+        def fine_fill(k: int) -> None:
+            # Each chunk owns rows [boundaries[k], boundaries[k + 1]); the boundary row itself is the next chunk's
+            # initial state, so the chunks never write the same row. Only the last chunk includes the t_max row.
+            end = boundaries[k + 1] + 1 if k == p - 1 else boundaries[k + 1]
+            _rk4(boundary_states[k], l1, l2, m1, m2, dt, out[boundaries[k]:end, 1:])
+
+        for _ in pool.map(fine_fill, range(p)):
+            pass
+
+    return out
 
 
 def print_bold(message: str) -> None:
     print(f"\033[1m{message}\033[0m", flush=True)
 
 
+# Per-process state for the frame rendering workers. Filled once per worker by _init_render_worker, so the
+# trajectory arrays are pickled once per process instead of once per frame.
+_render_state: dict = {}
+
+
+def _init_render_worker(x1: ndarray, y1: ndarray, x2: ndarray, y2: ndarray, l1: float, l2: float,
+                        circle_radius: float, max_trail: int) -> None:
+    """
+    Stashes everything _render_frame needs in the worker process and builds the figure and all its artists once.
+    Runs once per pool worker; _render_frame then only moves the existing artists around, since creating artists
+    and recomputing axis limits is the dominant per frame matplotlib cost.
+
+    :param x1: The x coordinates of the first bob in meters, one per time point.
+    :param y1: The y coordinates of the first bob in meters, one per time point.
+    :param x2: The x coordinates of the second bob in meters, one per time point.
+    :param y2: The y coordinates of the second bob in meters, one per time point.
+    :param l1: Rod length of the first pendulum in meters.
+    :param l2: Rod length of the second pendulum in meters.
+    :param circle_radius: The plotted bob circle radius.
+    :param max_trail: The number of time points the fading bob trail covers.
+    """
+    _render_state['x1'], _render_state['y1'] = x1, y1
+    _render_state['x2'], _render_state['y2'] = x2, y2
+    _render_state['max_trail'] = max_trail
+
+    fig = Figure(figsize=_fig_size, dpi=_fig_dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+
+    # The pendulum rods.
+    rod = ax.plot([], [], lw=2, c='k')[0]
+    # Circles representing the anchor point of rod 1, and bobs 1 and 2.
+    c0 = Circle((0, 0), circle_radius / 2, fc='k', zorder=10)
+    c1 = Circle((0, 0), circle_radius, fc='b', ec='b', zorder=10)
+    c2 = Circle((0, 0), circle_radius, fc='r', ec='r', zorder=10)
+    ax.add_patch(c0)
+    ax.add_patch(c1)
+    ax.add_patch(c2)
+
+    # Make a trail for each of the Pendulums
+    ns = 20  # The trail will be divided into 20 ns segments and plotted as a fading line.
+    # The alpha fade only depends on the segment index, so it is baked into the artists here once.
+    trails_1 = [ax.plot([], [], c='b', solid_capstyle='butt', lw=2, alpha=(j / ns) ** 2)[0] for j in range(ns)]
+    trails_2 = [ax.plot([], [], c='r', solid_capstyle='butt', lw=2, alpha=(j / ns) ** 2)[0] for j in range(ns)]
+
+    total_radius = l1 + l2 + circle_radius
+    ax.set_xlim(-total_radius, total_radius)
+    ax.set_ylim(-total_radius, total_radius)
+    ax.set_aspect('equal', adjustable='box')
+    ax.axis('off')
+
+    # Rasterize the static content (the background fill and the anchor circle) once and snapshot it; each frame
+    # restores the snapshot and only re-rasterizes the artists that actually move.
+    for artist in (rod, c1, c2, *trails_1, *trails_2):
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    _render_state['canvas'] = canvas
+    _render_state['ax'] = ax
+    _render_state['background'] = background
+    _render_state['rod'] = rod
+    _render_state['c1'], _render_state['c2'] = c1, c2
+    _render_state['trails_1'], _render_state['trails_2'] = trails_1, trails_2
+    _render_state['ns'] = ns
+
+
+def _render_frame(i: int) -> bytes:
+    """
+    Plot the double pendulum configuration for time point i and return the raw RGBA pixels. A top level function so
+    the process pool can pickle it; it reuses the worker's cached figure, updating the artist data in place, so the
+    per frame cost is just the data updates and the Agg rasterization.
+
+    :param i: The time point to render.
+    :return: The rendered frame as raw RGBA bytes, ready to be piped into ffmpeg.
+    """
+    x1, y1 = _render_state['x1'], _render_state['y1']
+    x2, y2 = _render_state['x2'], _render_state['y2']
+    max_trail = _render_state['max_trail']
+    canvas = _render_state['canvas']
+    ax = _render_state['ax']
+    background = _render_state['background']
+    rod = _render_state['rod']
+    c1, c2 = _render_state['c1'], _render_state['c2']
+    trails_1, trails_2 = _render_state['trails_1'], _render_state['trails_2']
+    ns = _render_state['ns']
+
+    rod.set_data([0, x1[i], x2[i]], [0, y1[i], y2[i]])
+    c1.center = (x1[i], y1[i])
+    c2.center = (x2[i], y2[i])
+
+    s = max_trail // ns
+    for j in range(ns):
+        i_min = i - (ns - j) * s
+        if i_min < 0:
+            trails_1[j].set_data([], [])
+            trails_2[j].set_data([], [])
+            continue
+        i_max = i_min + s + 1
+        trails_1[j].set_data(x1[i_min:i_max], y1[i_min:i_max])
+        trails_2[j].set_data(x2[i_min:i_max], y2[i_min:i_max])
+
+    # Blit instead of a full canvas.draw(): restore the cached background pixels and re-rasterize only the moving
+    # artists straight into the canvas's preallocated RGBA buffer.
+    canvas.restore_region(background)
+    ax.draw_artist(rod)
+    for trail in trails_1:
+        ax.draw_artist(trail)
+    for trail in trails_2:
+        ax.draw_artist(trail)
+    ax.draw_artist(c1)
+    ax.draw_artist(c2)
+    return bytes(canvas.buffer_rgba())
+
+
 def make_animations(time_positions, l1, l2) -> None:
     t, theta1, theta2 = time_positions[:, 0], time_positions[:, 1], time_positions[:, 3]
     dt = t[1] - t[0]
 
-    # Convert to Cartesian coordinates of the two bob positions.
-    x1 = l1 * np.sin(theta1)
-    y1 = -l1 * np.cos(theta1)
-    x2 = x1 + l2 * np.sin(theta2)
-    y2 = y1 - l2 * np.cos(theta2)
+    # Convert to Cartesian coordinates of the two bob positions. One preallocated (N, 4) buffer instead of four
+    # separate array expressions: each sin/cos is evaluated once and written straight into its column, so there are
+    # no intermediate temporaries and the four coordinate series stay adjacent in memory. These arrays only exist
+    # to be rasterized at 72 dpi, so float32 is plenty and halves the bytes the trail slicing loop moves; the
+    # physics stays in float64 in time_positions.
+    points = np.empty((t.size, 4), dtype=np.float32)
+    np.multiply(np.sin(theta1), l1, out=points[:, 0])
+    np.multiply(np.cos(theta1), -l1, out=points[:, 1])
+    points[:, 2] = points[:, 0] + l2 * np.sin(theta2)
+    points[:, 3] = points[:, 1] - l2 * np.cos(theta2)
+    x1, y1, x2, y2 = points.T
 
     # Plotted bob circle radius
     circle_radius = 0.15
@@ -161,67 +909,46 @@ def make_animations(time_positions, l1, l2) -> None:
     # This corresponds to max_trail time points.
     max_trail = int(trail_secs / dt)
 
-    def make_single_frame(i: int) -> None:
-        # Plot and save an image of the double pendulum configuration for time point i.
-        # The pendulum rods.
-        ax.plot([0, x1[i], x2[i]], [0, y1[i], y2[i]], lw=2, c='k')
-        # Circles representing the anchor point of rod 1, and bobs 1 and 2.
-        c0 = Circle((0, 0), circle_radius / 2, fc='k', zorder=10)
-        c1 = Circle((x1[i], y1[i]), circle_radius, fc='b', ec='b', zorder=10)
-        c2 = Circle((x2[i], y2[i]), circle_radius, fc='r', ec='r', zorder=10)
-        ax.add_patch(c0)
-        ax.add_patch(c1)
-        ax.add_patch(c2)
-
-        # Make a trail for each of the Pendulums
-        ns = 20  # The trail will be divided into 20 ns segments and plotted as a fading line.
-        s = max_trail // ns
-
-        for j in range(ns):
-            i_min = i - (ns - j) * s
-            if i_min < 0:
-                continue
-            i_max = i_min + s + 1
-            alpha = (j / ns) ** 2
-            ax.plot(x1[i_min:i_max], y1[i_min:i_max], c='b', solid_capstyle='butt', lw=2, alpha=alpha)
-            ax.plot(x2[i_min:i_max], y2[i_min:i_max], c='r', solid_capstyle='butt', lw=2, alpha=alpha)
-
-        total_radius = l1 + l2 + circle_radius
-        ax.set_xlim(-total_radius, total_radius)
-        ax.set_ylim(-total_radius, total_radius)
-        ax.set_aspect('equal', adjustable='box')
-        plt.axis('off')
-        plt.savefig(osp.join(this_dir, 'frames', 'img_{:05d}.png'.format(i // di)), dpi=72)
-        plt.cla()
-
     # Make an image every di time points, corresponding to a frame rate of fps 10 frames per second.
     fps = 10
     di = int(1 / fps / dt)
-    fig = plt.figure(figsize=(8.3333, 6.25), dpi=72)
-    ax = fig.add_subplot(111)
 
-    print_bold('\nMaking the frames.')
-    for i in range(0, t.size, di):
-        make_single_frame(i)
+    # The renderer and the rawvideo pipes have to agree on the exact pixel dimensions, which matplotlib rounds from
+    # the figure size, so ask a throwaway canvas rather than recomputing them here.
+    width, height = FigureCanvasAgg(Figure(figsize=_fig_size, dpi=_fig_dpi)).get_width_height()
 
-    print_bold('\nMaking the mp4 animation.')
-    (
-        ffmpeg
-            .input(osp.join(this_dir, 'frames', 'img_*.png'), pattern_type='glob', framerate=10)
-            .output(osp.join(this_dir, 'animations', 'double_pendulum_example.mp4'))
-            .run(quiet=True, overwrite_output=True)
-    )
+    def raw_video_input():
+        return ffmpeg.input('pipe:', format='rawvideo', pix_fmt='rgba', s=f'{width}x{height}', framerate=fps)
 
-    print_bold('\nMaking the gif animation.')
-    (
-        ffmpeg
-            .input(osp.join(this_dir, 'frames', 'img_*.png'), pattern_type='glob', framerate=10)
+    mp4_process = (
+        raw_video_input()
+            .output(osp.join(this_dir, 'animations', 'double_pendulum_example.mp4'), pix_fmt='yuv420p')
+            .overwrite_output()
+            .global_args('-loglevel', 'error', '-nostats')
+            .run_async(pipe_stdin=True)
+    )
+    gif_process = (
+        raw_video_input()
             .output(osp.join(this_dir, 'animations', 'double_pendulum.gif'))
-            .run(quiet=True, overwrite_output=True)
+            .overwrite_output()
+            .global_args('-loglevel', 'error', '-nostats')
+            .run_async(pipe_stdin=True)
     )
 
-    print_bold('\nDeleting all the frames.')
-    for f in glob.glob(osp.join(this_dir, 'frames', 'img_*.png')):
-        os.remove(f)
+    print_bold('\nMaking the mp4 and gif animations.')
+    # Every frame only reads from the shared arrays, so they can all render in parallel, one process per core.
+    # pool.map yields the frames in order, and each one is piped straight into both encoders: no PNG encode, no
+    # disk round trip, no cleanup afterwards.
+    init_args = (x1, y1, x2, y2, l1, l2, circle_radius, max_trail)
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_render_worker,
+                             initargs=init_args) as pool:
+        for frame in pool.map(_render_frame, range(0, t.size, di)):
+            mp4_process.stdin.write(frame)
+            gif_process.stdin.write(frame)
+
+    mp4_process.stdin.close()
+    gif_process.stdin.close()
+    mp4_process.wait()
+    gif_process.wait()
 
     print_bold('\nDone!')
@@ -6,6 +6,9 @@ import app.double_pendulum_functions as dpf
 
 Primitive = Union[str, bool, int, float]
 
+# The CLI takes degrees because degrees are easier for people to understand, but the physics runs in radians.
+_DEG2RAD = float(np.pi / 180.0)
+
 
 def parse_args(args: List[str]) -> Dict[str, Primitive]:
     def greater_than(parameter: float) -> Callable[[str], float]:
@@ -62,17 +65,11 @@ def parse_args(args: List[str]) -> Dict[str, Primitive]:
 def main(args) -> None:
     arg_dict = parse_args(args)
 
-    # Convert the degrees to radians. I made the input degrees because degrees are easier for people to understand.
-    deg_to_rad = lambda x: x * np.pi / 180
-    o1 = deg_to_rad(arg_dict['o1'])
-    w1 = deg_to_rad(arg_dict['w1'])
-    o2 = deg_to_rad(arg_dict['o2'])
-    w2 = deg_to_rad(arg_dict['w2'])
-
     # Make these casts for mypy to be happy. Everything is a float.
     dict: Dict[str, float] = {key: cast(float, value) for key, value in arg_dict.items()}
 
-    initials_positions = np.array([o1, w1, o2, w2])
+    # Convert the degrees to radians in one vectorized multiply.
+    initials_positions = np.array([dict['o1'], dict['w1'], dict['o2'], dict['w2']], dtype=np.float64) * _DEG2RAD
 
     time_positions = dpf.integrate(initials_positions, dict['l1'], dict['l2'], dict['m1'], dict['m2'], dict['t_max'],
                                    dict['dt'])
@@ -19,14 +19,147 @@ def test_energy():
     """
     l1, l2 = 1, 1
     m1, m2 = 1, 1
-    t_max, dt = 10_00, 0.01
+    t_max, dt = 1_000, 0.01
     initial_positions = np.array([2 * np.pi / 3, 31, 3 * np.pi / 4, 21])
 
     time_positions = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt)
 
-    initial_energy = dpf.calculate_total_energy(time_positions[0, 1:5], l1, l2, m1, m2)
-    final_energy = dpf.calculate_total_energy(time_positions[-1, 1:5], l1, l2, m1, m2)
+    energies = dpf.calculate_total_energy(time_positions[:, 1:5], l1, l2, m1, m2)
+    initial_energy = energies[0]
+    final_energy = energies[-1]
 
     energy_change_percentage = abs((final_energy - initial_energy) / initial_energy * 100)
 
     assert energy_change_percentage <= 1
+
+
+def test_verlet():
+    """
+    Test the symplectic Verlet method at its advertised long run configuration. Being symplectic, its energy error
+    should stay bounded over all 1,000 seconds, not just at the endpoint. When dt is too large for the trajectory the
+    implicit stages stop converging, which has to surface as a clear ValueError instead of a crash from deep inside
+    the compiled loop.
+    """
+    l1, l2 = 1, 1
+    m1, m2 = 1, 1
+    t_max = 1_000
+    initial_positions = np.array([2 * np.pi / 3, 31, 3 * np.pi / 4, 21])
+
+    time_positions = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, 0.01, method='verlet')
+
+    energies = dpf.calculate_total_energy(time_positions[:, 1:5], l1, l2, m1, m2)
+    max_drift_percentage = np.abs((energies - energies[0]) / energies[0] * 100).max()
+
+    assert max_drift_percentage <= 1
+
+    with pytest.raises(ValueError):
+        dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, 0.02, method='verlet')
+
+
+def test_lsoda():
+    """
+    Test the adaptive LSODA method. It is the accuracy-first option, so hold it to a much tighter energy bound than
+    the fixed step methods over its whole 100 second run.
+    """
+    l1, l2 = 1, 1
+    m1, m2 = 1, 1
+    t_max, dt = 100, 0.01
+    initial_positions = np.array([2 * np.pi / 3, 31, 3 * np.pi / 4, 21])
+
+    time_positions = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt, method='lsoda')
+
+    energies = dpf.calculate_total_energy(time_positions[:, 1:5], l1, l2, m1, m2)
+    max_drift_percentage = np.abs((energies - energies[0]) / energies[0] * 100).max()
+
+    assert max_drift_percentage <= 0.1
+
+
+def test_t_eval():
+    """
+    Test the sparse output storage. The t_eval rows have to match the corresponding rows of a full run exactly for
+    the fixed step methods, since t_eval only thins out what is stored, and malformed t_eval arrays have to be
+    rejected with a ValueError.
+    """
+    l1, l2 = 1.0, 1.2
+    m1, m2 = 1.0, 1.5
+    t_max, dt = 2.0, 0.01
+    initial_positions = np.array([2 * np.pi / 3, 0.7, 3 * np.pi / 4, -0.4])
+    t_eval = np.array([0.0, 1.23, t_max])
+
+    for method in ('rk4', 'verlet'):
+        full = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt, method=method)
+        sparse = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt, method=method, t_eval=t_eval)
+
+        assert sparse.shape == (t_eval.size, 5)
+        for row, t in zip(sparse, t_eval):
+            assert np.array_equal(row, full[round(t / dt)])
+
+    # LSODA evaluates its dense output at the requested times instead of thinning stored steps, so allow float noise.
+    full = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt, method='lsoda')
+    sparse = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt, method='lsoda', t_eval=t_eval)
+    for row, t in zip(sparse, t_eval):
+        assert np.allclose(row, full[round(t / dt)], atol=1e-9)
+
+    bad_t_evals = [[], [5.0, 5.0], [-1.0, 2.0], [0.0, t_max + 1], [1.0, 0.5]]
+    for bad_t_eval in bad_t_evals:
+        with pytest.raises(ValueError):
+            dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt, t_eval=np.array(bad_t_eval))
+
+    # Requesting t_max itself has to work even when round(t_max / dt) * dt lands a float ulp above t_max, as it
+    # does for t_max=0.7, dt=0.1.
+    full = dpf.integrate(initial_positions, l1, l2, m1, m2, 0.7, 0.1)
+    sparse = dpf.integrate(initial_positions, l1, l2, m1, m2, 0.7, 0.1, t_eval=np.array([0.0, 0.7]))
+    assert np.array_equal(sparse[0], full[0])
+    assert np.array_equal(sparse[-1, 1:], full[7, 1:])
+
+
+def test_integrate_batch():
+    """
+    Test that integrating N pendulums in one batch call gives the same trajectories as integrating each one on its
+    own. The parallel RK4 loop runs the exact same kernel per trajectory, so it has to match bit for bit; the
+    flattened odeint path solves a different (coupled in layout, not in physics) system with its own step selection,
+    so it only has to agree to solver accuracy.
+    """
+    initial_positions = np.array([[2 * np.pi / 3, 0.5, 3 * np.pi / 4, 0.3],
+                                  [0.5, -1.0, 1.0, 2.0],
+                                  [2.0, 3.0, -1.0, 0.0]])
+    l1s = np.array([1.0, 1.2, 0.8])
+    l2s = np.array([1.0, 0.9, 1.1])
+    m1s = np.array([1.0, 2.0, 0.5])
+    m2s = np.array([1.0, 1.5, 1.0])
+    t_max, dt = 2.0, 0.01
+
+    batch = dpf.integrate_batch(initial_positions, l1s, l2s, m1s, m2s, t_max, dt)
+    lsoda_batch = dpf.integrate_batch(initial_positions, l1s, l2s, m1s, m2s, t_max, dt, method='lsoda')
+
+    for k in range(initial_positions.shape[0]):
+        single = dpf.integrate(initial_positions[k], l1s[k], l2s[k], m1s[k], m2s[k], t_max, dt)
+        assert np.array_equal(batch[k], single)
+
+        lsoda_single = dpf.integrate(initial_positions[k], l1s[k], l2s[k], m1s[k], m2s[k], t_max, dt,
+                                     method='lsoda')
+        assert np.allclose(lsoda_batch[k], lsoda_single, atol=1e-4)
+
+
+def test_parareal():
+    """
+    Test that the parareal integrator reproduces the serial RK4 trajectory. Once the iteration converges, every
+    subinterval has been re-integrated by the fine propagator from converged boundary states, so the result should
+    agree with the serial run to the convergence tolerance, and the energy check should hold just like for the
+    serial method.
+    """
+    l1, l2 = 1, 1
+    m1, m2 = 1, 1
+    t_max, dt = 10, 0.01
+    initial_positions = np.array([2 * np.pi / 3, 31, 3 * np.pi / 4, 21])
+
+    parareal = dpf.integrate_parareal(initial_positions, l1, l2, m1, m2, t_max, dt)
+    serial = dpf.integrate(initial_positions, l1, l2, m1, m2, t_max, dt)
+
+    assert parareal.shape == serial[:parareal.shape[0]].shape
+    assert np.allclose(parareal, serial[:parareal.shape[0]], atol=1e-6)
+
+    energies = dpf.calculate_total_energy(parareal[:, 1:5], l1, l2, m1, m2)
+    max_drift_percentage = np.abs((energies - energies[0]) / energies[0] * 100).max()
+
+    assert max_drift_percentage <= 1
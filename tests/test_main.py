@@ -45,8 +45,8 @@ def test_main():
 
     main.main([])
 
-    # Check if the frames have been deleted.
-    assert not glob.glob(osp.join(parent_dir, 'app', 'frames', 'img_*.png'))
+    # Check that no frame images leaked anywhere; the frames are piped straight to ffmpeg and never touch disk.
+    assert not glob.glob(osp.join(parent_dir, 'app', '**', 'img_*.png'), recursive=True)
 
     # Check if the gif has been created.
     assert osp.isfile(osp.join(parent_dir, 'app', 'animations', 'double_pendulum.gif'))